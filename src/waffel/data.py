@@ -4,17 +4,23 @@ import datetime
 from pathlib import Path
 
 from waffel.classes import Student, FAK
+from waffel.output import Output
 
 
 def collator_sort_key(stud: Student) -> tuple[str, str]:
     return locale.strxfrm(stud.given_names), locale.strxfrm(stud.first_names)
 
-def load_students(students_csv: Path) -> list[Student]:
+def read_students(students_csv: Path) -> list[Student]:
     students = []
     with students_csv.open('r') as f:
         reader = csv.DictReader(f, delimiter=';')
         for line in reader:
             students.append(Student.from_dict(line))
+    return students
+
+
+def load_students(students_csv: Path) -> list[Student]:
+    students = read_students(students_csv)
     locale.setlocale(locale.LC_COLLATE, 'de_DE.utf8')
     students = list(sorted(students, key=collator_sort_key))
     return students
@@ -43,11 +49,10 @@ def load_mapping(mapping_md: Path) -> dict[str, list[FAK]]:
     return data
 
 
-def write_new_faks(output_directory: Path, students: list[Student], mapping: dict[str, list[FAK]]) -> list[str]:
-    output_file = output_directory / 'unknown_faks.txt'
+def write_new_faks(output: Output, students: list[Student], mapping: dict[str, list[FAK]]) -> list[str]:
     new_fak_strings = determine_new_faks(mapping, students)
-    print(f'Writing {len(new_fak_strings)} new FAKs to {output_file}')
-    output_file.write_text('\n'.join(new_fak_strings))
+    print(f'Writing {len(new_fak_strings)} new FAKs to {output.location("unknown_faks.txt")}')
+    output.write_text('unknown_faks.txt', '\n'.join(new_fak_strings))
     return new_fak_strings
 
 
@@ -64,6 +69,12 @@ def determine_new_faks(mapping: dict[str, list[FAK]], students: list[Student]) -
     new_fak_strings = sorted(str(fak) for fak in new_faks)
     return new_fak_strings
 
+def any_fak(haystack: list[FAK], needles: list[FAK] | None) -> bool:
+    if needles is None:
+        return True
+    return bool(len(set(haystack) & set(needles)))
+
+
 def filter_students_for_semester(students: list[Student], date: datetime.date) -> list[Student]:
     year = date.year
     semester_index = 1
@@ -1,30 +1,57 @@
 import json
-from collections import defaultdict
+from collections import Counter, defaultdict
 from fractions import Fraction
-from pathlib import Path
 
 from waffel.classes import FAK, Student
+from waffel.output import Output
 
+FakSignature = tuple[FAK, ...]
 
-def write_funds_distribution(output_directory: Path, mapping: dict[str, list[FAK]],
+
+def write_funds_distribution(output: Output, mapping: dict[str, list[FAK]],
                              students: list[Student]):
-    distribution: dict[str, Fraction] = defaultdict(lambda: Fraction(numerator=0, denominator=1))
-    for student in students:
-        fractions = get_fractions(student, mapping)
-        for fs, fraction in fractions.items():
-            distribution[fs] += fraction
-    write_distribution = {}
-    for fs, value in distribution.items():
-        write_distribution[fs] = {'numerator': value.numerator, 'denominator': value.denominator}
-    (output_directory / 'funds-distribution.json').write_text(json.dumps(write_distribution, indent=2))
+    distribution = get_distribution(group_by_signature(students), mapping)
+    write_distribution = serialize_distribution(distribution)
+    output.write_text('funds-distribution.json', json.dumps(write_distribution, indent=2))
+
+
+def serialize_distribution(distribution: dict[str, Fraction]) -> dict[str, dict[str, int]]:
+    return {fs: {'numerator': value.numerator, 'denominator': value.denominator} for fs, value in distribution.items()}
 
 
 def get_fractions(student: Student, mapping: dict[str, list[FAK]]) -> dict[str, Fraction]:
+    return get_fractions_for_faks(student.faks, invert_mapping(mapping))
+
+
+def get_fractions_for_faks(faks: FakSignature | list[FAK], fak_index: dict[FAK, list[str]]) -> dict[str, Fraction]:
     fractions: dict[str, Fraction] = defaultdict(lambda: Fraction(numerator=0, denominator=1))
-    for fak in student.faks:
-        fs_with_fak = [fs for fs in mapping if fak in mapping[fs]]
-        if not fs_with_fak:
-            fs_with_fak = ['unknown']
+    for fak in faks:
+        fs_with_fak = fak_index.get(fak) or ['unknown']
         for fs in fs_with_fak:
-            fractions[fs] += Fraction(numerator=1, denominator=len(student.faks) * len(fs_with_fak))
+            fractions[fs] += Fraction(numerator=1, denominator=len(faks) * len(fs_with_fak))
     return fractions
+
+
+def invert_mapping(mapping: dict[str, list[FAK]]) -> dict[FAK, list[str]]:
+    fak_index: dict[FAK, list[str]] = defaultdict(list)
+    for fs, faks in mapping.items():
+        for fak in dict.fromkeys(faks):
+            fak_index[fak].append(fs)
+    return fak_index
+
+
+def fak_signature(faks: list[FAK]) -> FakSignature:
+    return tuple(sorted(faks, key=lambda fak: (fak.degree, fak.subject)))
+
+
+def group_by_signature(students: list[Student]) -> Counter[FakSignature]:
+    return Counter(fak_signature(student.faks) for student in students)
+
+
+def get_distribution(signatures: Counter[FakSignature], mapping: dict[str, list[FAK]]) -> dict[str, Fraction]:
+    fak_index = invert_mapping(mapping)
+    distribution: dict[str, Fraction] = defaultdict(lambda: Fraction(numerator=0, denominator=1))
+    for signature, count in signatures.items():
+        for fs, fraction in get_fractions_for_faks(signature, fak_index).items():
+            distribution[fs] += fraction * count
+    return distribution
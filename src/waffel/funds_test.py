@@ -1,7 +1,7 @@
 from fractions import Fraction
 
 from waffel.classes import Student, FAK
-from waffel.funds import get_fractions
+from waffel.funds import get_fractions, get_distribution, group_by_signature
 
 
 class TestFunds:
@@ -123,6 +123,37 @@ class TestFunds:
             'VWL': Fraction(numerator=1, denominator=4),
         }
 
+    def test_distribution_matches_sum_of_fractions(self):
+        mapping = {
+            'Lehramt': [
+                FAK(degree='LA BA Gym Ge', subject='Deutsch'),
+                FAK(degree='LA BA Gym Ge', subject='Englisch'),
+            ],
+            'Germanistik': [
+                FAK(degree='LA BA Gym Ge', subject='Deutsch'),
+            ],
+        }
+        students = [
+            sample_student(faks=[
+                FAK(degree='LA BA Gym Ge', subject='Deutsch'),
+                FAK(degree='LA BA Gym Ge', subject='Englisch'),
+            ]),
+            sample_student(faks=[
+                FAK(degree='LA BA Gym Ge', subject='Englisch'),
+                FAK(degree='LA BA Gym Ge', subject='Deutsch'),
+            ]),
+            sample_student(faks=[
+                FAK(degree='Bachelor of Arts', subject='Volkswirtschaftslehre'),
+            ]),
+        ]
+        signatures = group_by_signature(students)
+        assert len(signatures) == 2
+        assert get_distribution(signatures, mapping) == {
+            'Lehramt': Fraction(numerator=3, denominator=2),
+            'Germanistik': Fraction(numerator=1, denominator=2),
+            'unknown': Fraction(numerator=1, denominator=1),
+        }
+
 
 def sample_student(faks: list[FAK]) -> Student:
     return Student(first_names='', given_names='', matriculation_number='', semester='', faks=faks)
@@ -0,0 +1,107 @@
+import csv
+import datetime
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from waffel.classes import FAK
+from waffel.data import any_fak, determine_new_faks, filter_students_for_semester, read_students
+from waffel.funds import get_distribution, group_by_signature, serialize_distribution
+
+INDEX_FILE = 'history-index.json'
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def snapshot_date(students_csv: Path) -> datetime.date | None:
+    match = re.fullmatch(r'students-(\d{4}-\d{2}-\d{2})\.csv', students_csv.name)
+    if not match:
+        return None
+    try:
+        return datetime.date.fromisoformat(match.group(1))
+    except ValueError:
+        return None
+
+
+def compute_aggregates(students_csv: Path, date: datetime.date, mapping: dict[str, list[FAK]]) -> dict:
+    students = read_students(students_csv)
+    unknown_faks = determine_new_faks(mapping, students)
+    students = filter_students_for_semester(students, date)
+    signatures = group_by_signature(students)
+    eligible = {
+        fs: sum(count for signature, count in signatures.items() if any_fak(list(signature), faks))
+        for fs, faks in mapping.items()
+    }
+    return {
+        'students': len(students),
+        'eligible': eligible,
+        'funds': serialize_distribution(get_distribution(signatures, mapping)),
+        'unknown_faks': len(unknown_faks),
+    }
+
+
+def update_history_index(output_directory: Path, mapping_md: Path, mapping: dict[str, list[FAK]]) -> dict[str, dict]:
+    index_file = output_directory / INDEX_FILE
+    old_index = json.loads(index_file.read_text()) if index_file.is_file() else {}
+    mapping_hash = file_hash(mapping_md)
+    index = {}
+    missing = []
+    for students_csv in sorted(output_directory.glob('students-*.csv')):
+        date = snapshot_date(students_csv)
+        if date is None:
+            print(f'Skipping {students_csv}, expected a name like students-YYYY-MM-DD.csv')
+            continue
+        snapshot_hash = file_hash(students_csv)
+        entry = old_index.get(str(date))
+        if entry and entry['snapshot_hash'] == snapshot_hash and entry['mapping_hash'] == mapping_hash:
+            index[str(date)] = entry
+        else:
+            index[str(date)] = {'snapshot_hash': snapshot_hash, 'mapping_hash': mapping_hash}
+            missing.append((students_csv, date))
+    print(f'Computing history for {len(missing)} of {len(index)} snapshots')
+    if missing:
+        with ProcessPoolExecutor() as executor:
+            futures = {
+                executor.submit(compute_aggregates, students_csv, date, mapping): (students_csv, date)
+                for students_csv, date in missing
+            }
+            for future in as_completed(futures):
+                students_csv, date = futures[future]
+                try:
+                    index[str(date)]['aggregates'] = future.result()
+                except (OSError, KeyError, ValueError, csv.Error) as e:
+                    print(f'Skipping {students_csv}, failed to compute history: {e!r}')
+                    del index[str(date)]
+    index_file.write_text(json.dumps(index, indent=2))
+    return index
+
+
+def to_history_table(index: dict[str, dict]) -> list[list[str]]:
+    data = [['date', 'fachschaft', 'eligible', 'funds_numerator', 'funds_denominator', 'unknown_faks']]
+    for date, entry in index.items():
+        aggregates = entry['aggregates']
+        fachschaften = list(dict.fromkeys([*aggregates['eligible'], *aggregates['funds']]))
+        for fs in fachschaften:
+            funds = aggregates['funds'].get(fs, {'numerator': 0, 'denominator': 1})
+            data.append([
+                date,
+                fs,
+                str(aggregates['eligible'].get(fs, '')),
+                str(funds['numerator']),
+                str(funds['denominator']),
+                str(aggregates['unknown_faks']),
+            ])
+    return data
+
+
+def write_history(output_directory: Path, index: dict[str, dict]):
+    print(f'Writing history of {len(index)} snapshots')
+    history = {date: entry['aggregates'] for date, entry in index.items()}
+    (output_directory / 'history.json').write_text(json.dumps(history, indent=2))
+    with (output_directory / 'history.csv').open('w', newline='') as f:
+        writer = csv.writer(f, delimiter=';', lineterminator='\n')
+        writer.writerows(to_history_table(index))
@@ -0,0 +1,84 @@
+import json
+
+from waffel.classes import FAK
+from waffel.data_test import create_students_file
+from waffel.history import to_history_table, update_history_index
+
+MAPPING = {
+    'Beispiel': [FAK(degree='degree', subject='degree_1_subject_1')],
+}
+
+
+class TestHistory:
+    def test_update_history_index(self, tmp_path):
+        mapping_md = create_mapping_file(tmp_path)
+        create_students_file([('Peter', 'Aalen'), ('Peter', 'Bebel')], tmp_path / 'students-2024-12-21.csv')
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-12-22.csv')
+
+        index = update_history_index(tmp_path, mapping_md, MAPPING)
+
+        assert list(index) == ['2024-12-21', '2024-12-22']
+        assert index['2024-12-21']['aggregates'] == {
+            'students': 2,
+            'eligible': {'Beispiel': 2},
+            'funds': {'Beispiel': {'numerator': 2, 'denominator': 1}},
+            'unknown_faks': 0,
+        }
+        assert index['2024-12-22']['aggregates']['students'] == 1
+
+    def test_update_history_index_only_recomputes_changed_snapshots(self, tmp_path):
+        mapping_md = create_mapping_file(tmp_path)
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-12-21.csv')
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-12-22.csv')
+        index = update_history_index(tmp_path, mapping_md, MAPPING)
+        for entry in index.values():
+            entry['aggregates'] = 'cached'
+        (tmp_path / 'history-index.json').write_text(json.dumps(index))
+
+        create_students_file([('Peter', 'Aalen'), ('Peter', 'Bebel')], tmp_path / 'students-2024-12-22.csv')
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-12-23.csv')
+        index = update_history_index(tmp_path, mapping_md, MAPPING)
+
+        assert index['2024-12-21']['aggregates'] == 'cached'
+        assert index['2024-12-22']['aggregates']['students'] == 2
+        assert index['2024-12-23']['aggregates']['students'] == 1
+
+        mapping_md.write_text(mapping_md.read_text() + '\n')
+        index = update_history_index(tmp_path, mapping_md, MAPPING)
+        assert index['2024-12-21']['aggregates']['students'] == 1
+
+    def test_update_history_index_skips_invalid_snapshots(self, tmp_path):
+        mapping_md = create_mapping_file(tmp_path)
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-12-21.csv')
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-12.backup.csv')
+        create_students_file([('Peter', 'Aalen')], tmp_path / 'students-2024-13-01.csv')
+        (tmp_path / 'students-2024-12-22.csv').write_text('"mtknr";"semester"\n"1";"20242"\n')
+
+        index = update_history_index(tmp_path, mapping_md, MAPPING)
+
+        assert list(index) == ['2024-12-21']
+        assert json.loads((tmp_path / 'history-index.json').read_text()) == index
+
+    def test_history_table(self):
+        index = {
+            '2024-12-21': {'aggregates': {
+                'students': 2,
+                'eligible': {'Beispiel': 1},
+                'funds': {
+                    'Beispiel': {'numerator': 1, 'denominator': 2},
+                    'unknown': {'numerator': 3, 'denominator': 2},
+                },
+                'unknown_faks': 1,
+            }},
+        }
+        assert to_history_table(index) == [
+            ['date', 'fachschaft', 'eligible', 'funds_numerator', 'funds_denominator', 'unknown_faks'],
+            ['2024-12-21', 'Beispiel', '1', '1', '2', '1'],
+            ['2024-12-21', 'unknown', '', '3', '2', '1'],
+        ]
+
+
+def create_mapping_file(tmp_path):
+    mapping_md = tmp_path / 'fachschaftenliste.md'
+    mapping_md.write_text('\n# Anlage Fachschaftenliste\n\nBeispiel\n--------\n  * degree_1_subject_1 (degree)\n')
+    return mapping_md
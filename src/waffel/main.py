@@ -5,9 +5,12 @@ import locale
 import shutil
 from pathlib import Path
 
-from waffel.data import load_students, load_mapping, write_new_faks, filter_students_for_semester
+from waffel.data import load_students, load_mapping, write_new_faks, filter_students_for_semester, read_students
 from waffel.funds import write_funds_distribution
+from waffel.history import update_history_index, write_history
+from waffel.output import ARCHIVE_SUFFIXES, ArchiveOutput, DirectoryOutput, Output
 from waffel.pdf import write_electoral_registers, register_fonts
+from waffel.scenario import compare_mappings, write_comparison
 
 
 def valid_date(s: str) -> datetime.date:
@@ -22,9 +25,34 @@ def _parse_args():
     parser.add_argument('--students-csv', type=Path, required=True)
     parser.add_argument('--mapping', type=Path, required=True)
     parser.add_argument('--date', type=valid_date, required=True)
+    parser.add_argument('--archive', type=Path,
+                        help='write the files for this date into a .zip, .tar or .tar.gz archive instead')
     parser.add_argument('output_directory', type=Path)
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.archive and not args.archive.name.endswith(ARCHIVE_SUFFIXES):
+        parser.error(f'argument --archive: unsupported archive type: {args.archive.name!r}. '
+                     f'Use one of: {", ".join(ARCHIVE_SUFFIXES)}')
+    return args
+
+
+def _parse_scenario_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--students-csv', type=Path, required=True)
+    parser.add_argument('--mapping', type=Path, action='append', required=True,
+                        help='may be given multiple times, the first mapping is the baseline')
+    parser.add_argument('--date', type=valid_date, required=True)
+    parser.add_argument('output_file', type=Path)
+    args = parser.parse_args()
+    if len(set(args.mapping)) != len(args.mapping):
+        parser.error('argument --mapping: each mapping may only be given once')
+    return args
+
 
+def _parse_history_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mapping', type=Path, required=True)
+    parser.add_argument('output_directory', type=Path)
+    return parser.parse_args()
 
 
 def prepare_date_directory(output_dir: Path):
@@ -32,6 +60,16 @@ def prepare_date_directory(output_dir: Path):
     output_dir.mkdir(exist_ok=True, parents=True)
 
 
+def create_output(archive: Path | None, output_dir: Path, date: datetime.date) -> Output:
+    if archive:
+        output_dir.mkdir(exist_ok=True, parents=True)
+        archive.parent.mkdir(exist_ok=True, parents=True)
+        return ArchiveOutput(archive)
+    date_directory = output_dir / 'electoral-registers' / str(date)
+    prepare_date_directory(date_directory)
+    return DirectoryOutput(date_directory)
+
+
 def copy_students_file(students_csv: Path, output_dir: Path, date: datetime.date):
     shutil.copyfile(students_csv, output_dir / f'students-{date}.csv')
 
@@ -59,11 +97,24 @@ def main():
     register_fonts(Path(__file__).parent.resolve().parent.parent)
     students = load_students(args.students_csv)
     mapping = load_mapping(args.mapping)
-    date_directory = args.output_directory / 'electoral-registers' / str(args.date)
-    prepare_date_directory(date_directory)
-    new_faks = write_new_faks(date_directory, students, mapping)
-    students = filter_students_for_semester(students, args.date)
-    write_electoral_registers(args.date, date_directory, mapping, students)
-    write_funds_distribution(date_directory, mapping, students)
+    with create_output(args.archive, args.output_directory, args.date) as output:
+        new_faks = write_new_faks(output, students, mapping)
+        students = filter_students_for_semester(students, args.date)
+        write_electoral_registers(args.date, output, mapping, students)
+        write_funds_distribution(output, mapping, students)
     copy_students_file(args.students_csv, args.output_directory, args.date)
     write_status_json(args.output_directory, new_faks)
+
+
+def scenario_main():
+    args = _parse_scenario_args()
+    students = filter_students_for_semester(read_students(args.students_csv), args.date)
+    mappings = {str(mapping_md): load_mapping(mapping_md) for mapping_md in args.mapping}
+    write_comparison(args.output_file, compare_mappings(students, mappings))
+
+
+def history_main():
+    args = _parse_history_args()
+    mapping = load_mapping(args.mapping)
+    index = update_history_index(args.output_directory, args.mapping, mapping)
+    write_history(args.output_directory, index)
@@ -0,0 +1,98 @@
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Self
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz')
+
+
+class Output(ABC):
+    @abstractmethod
+    def location(self, name: str) -> str:
+        ...
+
+    @abstractmethod
+    def write_bytes(self, name: str, content: bytes):
+        ...
+
+    def write_text(self, name: str, content: str):
+        self.write_bytes(name, content.encode())
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+class DirectoryOutput(Output):
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def location(self, name: str) -> str:
+        return str(self.directory / name)
+
+    def write_bytes(self, name: str, content: bytes):
+        (self.directory / name).write_bytes(content)
+
+
+class ArchiveOutput(Output):
+    def __init__(self, archive: Path):
+        self.archive = archive
+        self.manifest: dict[str, dict[str, int | str]] = {}
+
+    def location(self, name: str) -> str:
+        return f'{self.archive}:{name}'
+
+    def __enter__(self) -> Self:
+        if not self.archive.name.endswith(ARCHIVE_SUFFIXES):
+            raise ValueError(f'unsupported archive type: {self.archive.name}')
+        fd, temporary_name = tempfile.mkstemp(dir=self.archive.parent, prefix=f'.{self.archive.name}.')
+        self.temporary_file = Path(temporary_name)
+        self.file = os.fdopen(fd, 'wb')
+        self.zip_file: zipfile.ZipFile | None = None
+        self.tar_file: tarfile.TarFile | None = None
+        if self.archive.suffix == '.zip':
+            self.zip_file = zipfile.ZipFile(self.file, 'w', compression=zipfile.ZIP_DEFLATED)
+        elif self.archive.suffix == '.tar':
+            self.tar_file = tarfile.open(fileobj=self.file, mode='w')
+        else:
+            self.tar_file = tarfile.open(fileobj=self.file, mode='w:gz')
+        return self
+
+    def write_bytes(self, name: str, content: bytes):
+        self.manifest[name] = {'size': len(content), 'sha256': hashlib.sha256(content).hexdigest()}
+        self._add(name, content)
+
+    def _add(self, name: str, content: bytes):
+        if self.zip_file:
+            self.zip_file.writestr(name, content)
+        if self.tar_file:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mtime = int(time.time())
+            self.tar_file.addfile(info, io.BytesIO(content))
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if exc_type is None:
+                self._add('manifest.json', json.dumps(self.manifest, indent=2).encode())
+            if self.zip_file:
+                self.zip_file.close()
+            if self.tar_file:
+                self.tar_file.close()
+            self.file.close()
+            if exc_type is None:
+                umask = os.umask(0)
+                os.umask(umask)
+                self.temporary_file.chmod(0o666 & ~umask)
+                self.temporary_file.replace(self.archive)
+        finally:
+            self.temporary_file.unlink(missing_ok=True)
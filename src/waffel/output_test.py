@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from waffel.output import ArchiveOutput
+
+
+class TestOutput:
+    def test_zip_archive_contains_files_and_manifest(self, tmp_path):
+        archive = tmp_path / 'output.zip'
+        with ArchiveOutput(archive) as output:
+            output.write_text('unknown_faks.txt', 'a\nb')
+            output.write_bytes('register.pdf', b'%PDF')
+
+        with zipfile.ZipFile(archive) as f:
+            assert f.namelist() == ['unknown_faks.txt', 'register.pdf', 'manifest.json']
+            assert f.read('register.pdf') == b'%PDF'
+            manifest = json.loads(f.read('manifest.json'))
+        assert manifest == {
+            'unknown_faks.txt': {'size': 3, 'sha256': hashlib.sha256(b'a\nb').hexdigest()},
+            'register.pdf': {'size': 4, 'sha256': hashlib.sha256(b'%PDF').hexdigest()},
+        }
+        assert list(tmp_path.iterdir()) == [archive]
+
+    @pytest.mark.parametrize('archive_name', ['output.tar', 'output.tar.gz'])
+    def test_tar_archive_contains_files_and_manifest(self, tmp_path, archive_name):
+        archive = tmp_path / archive_name
+        with ArchiveOutput(archive) as output:
+            output.write_text('funds-distribution.json', '{}')
+
+        with tarfile.open(archive) as f:
+            assert f.getnames() == ['funds-distribution.json', 'manifest.json']
+            assert f.extractfile('funds-distribution.json').read() == b'{}'
+            assert json.loads(f.extractfile('manifest.json').read())['funds-distribution.json']['size'] == 2
+        assert list(tmp_path.iterdir()) == [archive]
+
+    def test_archive_is_not_written_on_error(self, tmp_path):
+        archive = tmp_path / 'output.zip'
+        archive.write_bytes(b'previous run')
+        with pytest.raises(ValueError), ArchiveOutput(archive) as output:
+            output.write_text('unknown_faks.txt', 'a')
+            raise ValueError()
+
+        assert archive.read_bytes() == b'previous run'
+        assert list(tmp_path.iterdir()) == [archive]
+
+    def test_unsupported_archive_type(self, tmp_path):
+        with pytest.raises(ValueError, match='unsupported archive type: output.tar.xz'), \
+                ArchiveOutput(tmp_path / 'output.tar.xz'):
+            pass
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_archive_respects_umask(self, tmp_path):
+        umask = os.umask(0o027)
+        try:
+            with ArchiveOutput(tmp_path / 'output.zip') as output:
+                output.write_text('unknown_faks.txt', 'a')
+        finally:
+            os.umask(umask)
+
+        assert (tmp_path / 'output.zip').stat().st_mode & 0o777 == 0o640
@@ -1,4 +1,6 @@
 import datetime
+import io
+import json
 import re
 from pathlib import Path
 
@@ -13,6 +15,8 @@ from reportlab.pdfgen.canvas import Canvas
 from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak, LongTable, TableStyle, Table, Flowable, Spacer
 
 from waffel.classes import Student, FAK
+from waffel.data import any_fak
+from waffel.output import Output
 
 TABLE_STYLE = TableStyle([
     ('FONTNAME', (0, 0), (-1, 0), 'LatoBold'),
@@ -41,12 +45,33 @@ def register_fonts(base_folder: Path):
     pdfmetrics.registerFont(TTFont('LatoRegular', lato_path / 'Lato-Regular.ttf'))
 
 
-def to_table(students: list[Student]) -> list[list[str | Paragraph]]:
+# records the printed page number of its table row in index when it is drawn
+class IndexedParagraph(Paragraph):
+
+    def __init__(self, text: str, style: ParagraphStyle, index: list[list], matriculation_number: str, row: int):
+        super().__init__(text, style=style)
+        self.index = index
+        self.matriculation_number = matriculation_number
+        self.row = row
+
+    def draw(self):
+        self.index.append([self.matriculation_number, self.canv.getPageNumber() - 1, self.row])
+        super().draw()
+
+
+def matriculation_sort_key(matriculation_number: str) -> tuple[int, str]:
+    if matriculation_number.isdigit():
+        return int(matriculation_number), matriculation_number
+    return -1, matriculation_number
+
+
+def to_table(students: list[Student], index: list[list]) -> list[list[str | Paragraph]]:
     data: list[list[str | Paragraph]] = [['Lfd. Nr.', 'Name', 'Matrikelnr.']]
     for i, student in enumerate(students, start=1):
         data.append([
             f'{i:n}',
-            Paragraph(f'{student.given_names}, {student.first_names}', style=PARAGRAPH_STYLE),
+            IndexedParagraph(f'{student.given_names}, {student.first_names}', PARAGRAPH_STYLE, index,
+                             str(student.matriculation_number), i),
             str(student.matriculation_number),
         ])
     data.append(['- - -', '- - - E N D E - - -', '- - -'])
@@ -98,26 +123,23 @@ def title_page(subtitle: str, deadline: datetime.date, first_election_day: datet
     ]
 
 
-def any_fak(haystack: list[FAK], needles: list[FAK] | None) -> bool:
-    if needles is None:
-        return True
-    return bool(len(set(haystack) & set(needles)))
-
-
 def write_electoral_register(
         fs_name: str,
         deadline: datetime.date,
         first_election_day: datetime.date,
         students: list[Student],
         faks: list[FAK] | None,
-        output_directory: Path,
-):
+        output: Output,
+) -> list[list]:
     fs_id = re.sub(r'[^a-zA-Z0-9]+', '-', fs_name)
-    doc = SimpleDocTemplate(str(output_directory / f'{fs_id}.pdf'), pagesize=A4, leftMargin=15 * mm,
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=15 * mm,
                             rightMargin=15 * mm, topMargin=15 * mm, bottomMargin=15 * mm)
     eligible_students = [student for student in students if any_fak(student.faks, faks)]
     items = title_page(fs_name, deadline, first_election_day, len(eligible_students))
-    t = LongTable(to_table(eligible_students), repeatRows=1, colWidths=[20 * mm, 140 * mm, 25 * mm], style=TABLE_STYLE)
+    index: list[list] = []
+    t = LongTable(to_table(eligible_students, index), repeatRows=1, colWidths=[20 * mm, 140 * mm, 25 * mm],
+                  style=TABLE_STYLE)
     items.append(t)
     if faks:
         items.extend([
@@ -130,16 +152,30 @@ def write_electoral_register(
         ft = Table(to_faks_table(faks), repeatRows=1, colWidths=[20 * mm, 50 * mm, 115 * mm], style=TABLE_STYLE)
         items.append(ft)
     doc.build(items, onFirstPage=title_page_func, onLaterPages=content_pages)
+    output.write_bytes(f'{fs_id}.pdf', buffer.getvalue())
+    index.sort(key=lambda entry: matriculation_sort_key(entry[0]))
+    output.write_text(f'{fs_id}.index.json', json.dumps(index))
+    return index
 
 
-def write_electoral_registers(today: datetime.date, output_directory: Path, mapping: dict[str, list[FAK]],
+def write_electoral_registers(today: datetime.date, output: Output, mapping: dict[str, list[FAK]],
                               students: list[Student]):
+    merged_index: dict[str, list[list]] = {}
     first_election_day = today + datetime.timedelta(days=30)
     for fs, faks in mapping.items():
         print(f'Generating electoral register for {fs=}')
-        write_electoral_register(f'Fachschaft {fs}',
-                                 today, first_election_day, students, faks, output_directory)
+        index = write_electoral_register(f'Fachschaft {fs}',
+                                         today, first_election_day, students, faks, output)
+        merge_index(merged_index, f'Fachschaft {fs}', index)
     first_election_day = today + datetime.timedelta(days=45)
     print('Generating full electoral register')
-    write_electoral_register('Wahl zum Studierendenparlament',
-                             today, first_election_day, students, None, output_directory)
+    index = write_electoral_register('Wahl zum Studierendenparlament',
+                                     today, first_election_day, students, None, output)
+    merge_index(merged_index, 'Wahl zum Studierendenparlament', index)
+    merged_index = dict(sorted(merged_index.items(), key=lambda item: matriculation_sort_key(item[0])))
+    output.write_text('electoral-registers-index.json', json.dumps(merged_index))
+
+
+def merge_index(merged_index: dict[str, list[list]], fs_name: str, index: list[list]):
+    for matriculation_number, page, row in index:
+        merged_index.setdefault(matriculation_number, []).append([fs_name, page, row])
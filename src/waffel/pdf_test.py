@@ -0,0 +1,42 @@
+import datetime
+import json
+from pathlib import Path
+
+from waffel.classes import FAK, Student
+from waffel.output import DirectoryOutput
+from waffel.pdf import register_fonts, write_electoral_registers
+
+HISTORY = FAK(degree='Bachelor of Arts', subject='Geschichte')
+MAGIC = FAK(degree='Bachelor of Science', subject='Zauberei')
+
+
+class TestPdf:
+    def test_write_electoral_registers_writes_page_index(self, tmp_path):
+        register_fonts(Path(__file__).parent.resolve().parent.parent)
+        students = [
+            Student(first_names='Peter', given_names=f'Beispiel {i:03}', matriculation_number=f'{50 * i}',
+                    semester='20242', faks=[HISTORY] if i % 2 else [MAGIC])
+            for i in range(1, 201)
+        ]
+        mapping = {'Geschichte': [HISTORY], 'Zauberei': [MAGIC]}
+
+        write_electoral_registers(datetime.date(2024, 12, 24), DirectoryOutput(tmp_path), mapping, students)
+
+        index = json.loads((tmp_path / 'Wahl-zum-Studierendenparlament.index.json').read_text())
+        assert len(index) == 200
+        assert [entry[0] for entry in index] == [f'{50 * i}' for i in range(1, 201)]
+        rows = {row: page for _, page, row in index}
+        assert sorted(rows) == list(range(1, 201))
+        assert rows[1] == 1
+        assert rows[200] > 1
+        assert [rows[row] for row in sorted(rows)] == sorted(rows.values())
+        assert json.loads((tmp_path / 'Fachschaft-Geschichte.index.json').read_text())[0] == ['50', 1, 1]
+
+        merged_index = json.loads((tmp_path / 'electoral-registers-index.json').read_text())
+        assert len(merged_index) == 200
+        assert list(merged_index)[:3] == ['50', '100', '150']
+        assert merged_index['50'] == [['Fachschaft Geschichte', 1, 1], ['Wahl zum Studierendenparlament', 1, 1]]
+        assert merged_index['10000'] == [
+            ['Fachschaft Zauberei', rows[100], 100],
+            ['Wahl zum Studierendenparlament', rows[200], 200],
+        ]
@@ -0,0 +1,33 @@
+import csv
+from fractions import Fraction
+from pathlib import Path
+
+from waffel.classes import FAK, Student
+from waffel.funds import get_distribution, group_by_signature
+
+
+def compare_mappings(students: list[Student], mappings: dict[str, dict[str, list[FAK]]]) -> dict[
+    str, dict[str, Fraction]]:
+    signatures = group_by_signature(students)
+    return {name: get_distribution(signatures, mapping) for name, mapping in mappings.items()}
+
+
+def to_comparison_table(distributions: dict[str, dict[str, Fraction]]) -> list[list[str]]:
+    names = list(distributions)
+    fachschaften = sorted({fs for distribution in distributions.values() for fs in distribution})
+    data = [['Fachschaft', *names, *(f'Delta {name}' for name in names[1:])]]
+    for fs in fachschaften:
+        values = [distributions[name].get(fs, Fraction(0)) for name in names]
+        data.append([
+            fs,
+            *(str(value) for value in values),
+            *(str(value - values[0]) for value in values[1:]),
+        ])
+    return data
+
+
+def write_comparison(output_file: Path, distributions: dict[str, dict[str, Fraction]]):
+    print(f'Writing comparison of {len(distributions)} mappings to {output_file}')
+    with output_file.open('w', newline='') as f:
+        writer = csv.writer(f, delimiter=';', lineterminator='\n')
+        writer.writerows(to_comparison_table(distributions))
@@ -0,0 +1,40 @@
+from fractions import Fraction
+
+from waffel.classes import FAK, Student
+from waffel.scenario import compare_mappings, to_comparison_table
+
+HISTORY = FAK(degree='Bachelor of Arts', subject='Geschichte')
+MAGIC = FAK(degree='Bachelor of Science', subject='Zauberei')
+
+
+class TestScenario:
+    def test_compare_mappings(self):
+        students = [
+            sample_student([HISTORY]),
+            sample_student([HISTORY, MAGIC]),
+            sample_student([MAGIC, HISTORY]),
+        ]
+        mappings = {
+            'current': {'Geschichte': [HISTORY], 'Zauberei': [MAGIC]},
+            'merged': {'Geschichte': [HISTORY, MAGIC]},
+        }
+        assert compare_mappings(students, mappings) == {
+            'current': {'Geschichte': Fraction(2), 'Zauberei': Fraction(1)},
+            'merged': {'Geschichte': Fraction(3)},
+        }
+
+    def test_comparison_table(self):
+        distributions = {
+            'current': {'Geschichte': Fraction(2), 'Zauberei': Fraction(1)},
+            'merged': {'Geschichte': Fraction(5, 2), 'unknown': Fraction(1, 2)},
+        }
+        assert to_comparison_table(distributions) == [
+            ['Fachschaft', 'current', 'merged', 'Delta merged'],
+            ['Geschichte', '2', '5/2', '1/2'],
+            ['Zauberei', '1', '0', '-1'],
+            ['unknown', '0', '1/2', '1/2'],
+        ]
+
+
+def sample_student(faks: list[FAK]) -> Student:
+    return Student(first_names='', given_names='', matriculation_number='', semester='', faks=faks)
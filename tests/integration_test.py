@@ -1,5 +1,6 @@
 import json
 import shutil
+import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 from subprocess import run, CompletedProcess
@@ -26,6 +27,9 @@ class TestIntegration:
         assert (electoral_registers_folder / 'Fachschaft-Altkatholisches-Seminar.pdf').is_file()
         assert (electoral_registers_folder / 'Fachschaft-Anglistik-Amerikanistik-und-Keltologie.pdf').is_file()
         assert (electoral_registers_folder / 'Wahl-zum-Studierendenparlament.pdf').is_file()
+        assert (electoral_registers_folder / 'Fachschaft-Lehramt.index.json').is_file()
+        assert (electoral_registers_folder / 'Wahl-zum-Studierendenparlament.index.json').is_file()
+        assert (electoral_registers_folder / 'electoral-registers-index.json').is_file()
         assert (electoral_registers_folder / 'unknown_faks.txt').read_text().splitlines() == unassigned_faks
         assert (tmp_path / 'output' / 'students-2024-12-24.csv').is_file()
         funds_distribution = json.loads((electoral_registers_folder / 'funds-distribution.json').read_text())
@@ -42,16 +46,115 @@ class TestIntegration:
         assert status['unassigned_faks'] == unassigned_faks
         assert_pdf_does_not_contain_text(lehramt_pdf, tmp_path, 'Gunkel')
 
+    def test_archive(self, tmp_path):
+        create_sample_data(tmp_path)
+        archive = tmp_path / 'archives' / 'electoral-registers-2024-12-24.zip'
+
+        run_waffel(tmp_path, archive=archive)
+
+        assert not (tmp_path / 'output' / 'electoral-registers').exists()
+        assert (tmp_path / 'output' / 'students-2024-12-24.csv').is_file()
+        with zipfile.ZipFile(archive) as f:
+            names = f.namelist()
+            manifest = json.loads(f.read('manifest.json'))
+            funds_distribution = json.loads(f.read('funds-distribution.json'))
+        assert 'Fachschaft-Lehramt.pdf' in names
+        assert 'Wahl-zum-Studierendenparlament.pdf' in names
+        assert 'unknown_faks.txt' in names
+        assert sorted(manifest) == sorted(name for name in names if name != 'manifest.json')
+        assert funds_distribution['unknown'] == {'numerator': 1, 'denominator': 1}
+
+    def test_history(self, tmp_path):
+        create_sample_data(tmp_path)
+
+        run(['waffel-history',
+             '--mapping', str(tmp_path / 'fachschaftenliste.md'),
+             str(tmp_path / 'output'),
+             ], check=True, capture_output=True, text=True)
+
+        history = json.loads((tmp_path / 'output' / 'history.json').read_text())
+        assert list(history) == ['2024-12-21', '2024-12-22', '2024-12-23']
+        assert history['2024-12-22'] == {
+            'students': 5,
+            'eligible': {
+                'Agrarwissenschaften': 1,
+                'Altkatholisches Seminar': 3,
+                'Anglistik, Amerikanistik und Keltologie': 2,
+                'Lehramt': 0,
+            },
+            'funds': {
+                'Agrarwissenschaften': {'numerator': 1, 'denominator': 2},
+                'Altkatholisches Seminar': {'numerator': 5, 'denominator': 2},
+                'Anglistik, Amerikanistik und Keltologie': {'numerator': 1, 'denominator': 1},
+                'unknown': {'numerator': 1, 'denominator': 1},
+            },
+            'unknown_faks': 4,
+        }
+        history_csv = (tmp_path / 'output' / 'history.csv').read_bytes()
+        assert b'\r' not in history_csv
+        rows = [line.split(';') for line in history_csv.decode().splitlines()]
+        assert rows[0] == ['date', 'fachschaft', 'eligible', 'funds_numerator', 'funds_denominator', 'unknown_faks']
+        assert ['2024-12-22', 'unknown', '', '1', '1', '4'] in rows
+
+    def test_unsupported_archive_type(self, tmp_path):
+        create_sample_data(tmp_path)
+
+        result = run_waffel(tmp_path, succeeds=False, archive=tmp_path / 'run.tar.xz')
+
+        assert "waffel: error: argument --archive: unsupported archive type: 'run.tar.xz'" in result.stderr
+        assert not (tmp_path / 'run.tar.xz').exists()
+
     def test_invalid_date_format(self, tmp_path):
         result = run_waffel(tmp_path, date='1.1.2025', succeeds=False)
         assert "waffel: error: argument --date: not a valid date: '1.1.2025'. Use format: YYYY-MM-DD" in result.stderr
 
+    def test_scenario_comparison(self, tmp_path):
+        create_sample_data(tmp_path)
+        variant = tmp_path / 'variant.md'
+        variant.write_text((tmp_path / 'fachschaftenliste.md').read_text().replace(
+            '  * Agrarwissenschaften (Bachelor of Science)\n', ''))
+
+        run(['waffel-scenario',
+             '--students-csv', str(tmp_path / 'students.csv'),
+             '--mapping', str(tmp_path / 'fachschaftenliste.md'),
+             '--mapping', str(variant),
+             '--date', '2024-12-24',
+             str(tmp_path / 'comparison.csv'),
+             ], check=True, capture_output=True, text=True)
+
+        rows = [line.split(';') for line in (tmp_path / 'comparison.csv').read_text().splitlines()]
+        assert rows == [
+            ['Fachschaft', str(tmp_path / 'fachschaftenliste.md'), str(variant), f'Delta {variant}'],
+            ['Agrarwissenschaften', '1/2', '0', '-1/2'],
+            ['Altkatholisches Seminar', '5/2', '5/2', '0'],
+            ['Anglistik, Amerikanistik und Keltologie', '1', '1', '0'],
+            ['unknown', '1', '3/2', '1/2'],
+        ]
+        assert b'\r' not in (tmp_path / 'comparison.csv').read_bytes()
+
+    def test_scenario_rejects_duplicate_mappings(self, tmp_path):
+        create_sample_data(tmp_path)
+
+        result = run(['waffel-scenario',
+                      '--students-csv', str(tmp_path / 'students.csv'),
+                      '--mapping', str(tmp_path / 'fachschaftenliste.md'),
+                      '--mapping', str(tmp_path / 'fachschaftenliste.md'),
+                      '--date', '2024-12-24',
+                      str(tmp_path / 'comparison.csv'),
+                      ], check=False, capture_output=True, text=True)
+
+        assert result.returncode != 0
+        assert 'argument --mapping: each mapping may only be given once' in result.stderr
+        assert not (tmp_path / 'comparison.csv').exists()
+
 
-def run_waffel(folder: Path, date: str = '2024-12-24', succeeds=True) -> CompletedProcess:
+def run_waffel(folder: Path, date: str = '2024-12-24', succeeds=True, archive: Path | None = None) -> CompletedProcess:
+    archive_args = ['--archive', str(archive)] if archive else []
     return run(['waffel',
                 '--students-csv', str(folder / 'students.csv'),
                 '--mapping', str(folder / 'fachschaftenliste.md'),
                 '--date', date,
+                *archive_args,
                 str(folder / 'output'),
                 ], check=succeeds, capture_output=True, text=True)
 